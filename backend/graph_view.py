@@ -0,0 +1,377 @@
+"""Server-side level of detail for large graphs.
+
+Nodes are grouped into communities with vectorised label propagation and laid
+out in two stages: community centres on a size-ordered sunflower spiral,
+relaxed with a small force simulation over the community graph, then members
+on a sunflower around their centre with hubs in the middle. Everything is
+numpy over row indices, so the browser never has to run a force simulation
+over the full graph — it only receives a summary of communities or a page of
+one neighbourhood, with coordinates attached.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+from models import ENTITY_COLORS, EntityType, GraphSession, Node
+from persistence import StoredEdges, StoredNodes
+
+# Graphs up to this size are still sent to the browser in full
+FULL_GRAPH_LIMIT = 2000
+
+NODE_SPACING = 12.0
+GOLDEN_ANGLE = np.pi * (3 - np.sqrt(5))
+LABEL_PROPAGATION_ROUNDS = 15
+LAYOUT_COMMUNITIES = 300
+LAYOUT_ITERATIONS = 60
+
+_ENTITY_TYPES = list(EntityType)
+
+
+@dataclass
+class GraphView:
+    community: np.ndarray          # community id per node row, 0 = largest
+    x: np.ndarray
+    y: np.ndarray
+    degree: np.ndarray
+    types: np.ndarray              # index into EntityType per node row
+    adjacency: sparse.csr_matrix   # symmetric, unweighted
+    edge_source: np.ndarray        # node row per edge, aligned with session.edges
+    edge_target: np.ndarray
+    ids: Optional[List[str]] = field(default=None, repr=False)
+    index: Optional[Dict[str, int]] = field(default=None, repr=False)
+
+
+def _node_columns(session: GraphSession):
+    nodes = session.nodes
+    if isinstance(nodes, StoredNodes):
+        return None, None, np.asarray(nodes.type_codes, dtype=np.int64)
+    ids = list(nodes.keys())
+    index = {nid: i for i, nid in enumerate(ids)}
+    types = np.array([_ENTITY_TYPES.index(n.type) for n in nodes.values()], dtype=np.int64)
+    return ids, index, types
+
+
+def _edge_columns(session: GraphSession, index: Optional[Dict[str, int]]):
+    edges = session.edges
+    if isinstance(edges, StoredEdges):
+        return (np.asarray(edges.source_rows, dtype=np.int64),
+                np.asarray(edges.target_rows, dtype=np.int64))
+    src = np.array([index[e.source_id] for e in edges], dtype=np.int64)
+    dst = np.array([index[e.target_id] for e in edges], dtype=np.int64)
+    return src, dst
+
+
+def _label_propagation(adjacency: sparse.csr_matrix) -> np.ndarray:
+    """Semi-synchronous label propagation.
+
+    Each round every node computes its most common neighbour label, but only a
+    random half adopt it; fully synchronous updates make stars and pairs swap
+    labels forever. Ties go to a fixed random priority rather than the label
+    value, which would otherwise flood whole components with the lowest id.
+    """
+    n = adjacency.shape[0]
+    if adjacency.nnz == 0:
+        # No votes to count: every node is its own community
+        return np.arange(n)
+    rng = np.random.default_rng(0)
+    rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(adjacency.indptr))
+    cols = adjacency.indices
+    priority = rng.permutation(n)
+    label_of = np.argsort(priority)
+    labels = np.arange(n)
+
+    for _ in range(LABEL_PROPAGATION_ROUNDS):
+        # One sort over (node, label priority) keys groups every node's votes
+        keys = rows * n + priority[labels[cols]]
+        keys.sort()
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        counts = np.diff(np.r_[starts, len(keys)])
+        run_node, run_priority = keys[starts] // n, keys[starts] % n
+
+        node_starts = np.flatnonzero(np.r_[True, run_node[1:] != run_node[:-1]])
+        most = np.maximum.reduceat(counts, node_starts)
+        winners = np.flatnonzero(counts == np.repeat(most, np.diff(np.r_[node_starts, len(counts)])))
+        winners = winners[np.r_[True, run_node[winners][1:] != run_node[winners][:-1]]]
+
+        candidate = labels.copy()
+        candidate[run_node[winners]] = label_of[run_priority[winners]]
+        if np.array_equal(candidate, labels):
+            break
+        labels = np.where(rng.random(n) < 0.5, candidate, labels)
+
+    # Renumber so community 0 is the largest
+    _, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    rank = np.empty_like(sizes)
+    rank[np.argsort(-sizes, kind="stable")] = np.arange(len(sizes))
+    return rank[inverse]
+
+
+def _sunflower(count: int, spacing: float):
+    i = np.arange(count, dtype=np.float64)
+    radius = spacing * np.sqrt(i + 0.5)
+    return radius * np.cos(i * GOLDEN_ANGLE), radius * np.sin(i * GOLDEN_ANGLE)
+
+
+def _relax_centres(cx, cy, radii, src, dst, weight):
+    """Fruchterman-Reingold style pass over the biggest communities only."""
+    pos = np.stack([cx, cy], axis=1)
+    rest = radii[:, None] + radii[None, :] + NODE_SPACING
+    step = rest.mean()
+    for _ in range(LAYOUT_ITERATIONS):
+        delta = pos[:, None, :] - pos[None, :, :]
+        dist = np.sqrt((delta ** 2).sum(-1)) + 1e-6
+        # Repel only overlapping or nearby discs so the spiral packing holds
+        push = np.clip(rest * 1.5 - dist, 0, None) / dist
+        np.fill_diagonal(push, 0)
+        force = (delta * push[..., None]).sum(1)
+        if len(src):
+            pull = pos[dst] - pos[src]
+            length = np.sqrt((pull ** 2).sum(-1)) + 1e-6
+            stretch = (np.clip(length - rest[src, dst], 0, None) / length * np.log1p(weight))[:, None] * 0.05
+            np.add.at(force, src, pull * stretch)
+            np.add.at(force, dst, -pull * stretch)
+        norm = np.sqrt((force ** 2).sum(-1)) + 1e-6
+        pos += force / norm[:, None] * np.minimum(norm, step)[:, None]
+        step *= 0.95
+    return pos[:, 0], pos[:, 1]
+
+
+def _layout(community: np.ndarray, degree: np.ndarray, src: np.ndarray, dst: np.ndarray):
+    n = len(community)
+    sizes = np.bincount(community)
+    radii = NODE_SPACING * np.sqrt(sizes)
+
+    # Community centres: largest in the middle, each spiral slot sized to fit its disc
+    area = np.cumsum((2 * radii + NODE_SPACING) ** 2)
+    theta = np.arange(len(sizes)) * GOLDEN_ANGLE
+    ring = np.sqrt(area / np.pi) - radii
+    cx, cy = ring * np.cos(theta), ring * np.sin(theta)
+
+    k = min(len(sizes), LAYOUT_COMMUNITIES)
+    cs, cd = community[src], community[dst]
+    keep = (cs != cd) & (cs < k) & (cd < k)
+    pairs, weight = np.unique(np.sort(np.stack([cs[keep], cd[keep]], axis=1), axis=1), axis=0, return_counts=True)
+    if k > 1:
+        cx[:k], cy[:k] = _relax_centres(cx[:k], cy[:k], radii[:k], pairs[:, 0], pairs[:, 1], weight)
+
+    # Members: sunflower around the centre, ordered by degree so hubs sit in the middle
+    order = np.lexsort((-degree, community))
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n) - starts[community[order]]
+    dx, dy = _sunflower(int(sizes.max()), NODE_SPACING)
+    x = cx[community] + dx[rank]
+    y = cy[community] + dy[rank]
+    return x.astype(np.float32), y.astype(np.float32)
+
+
+def build_view(session: GraphSession) -> GraphView:
+    ids, index, types = _node_columns(session)
+    n = len(session.nodes)
+    src, dst = _edge_columns(session, index)
+
+    adjacency = sparse.csr_matrix(
+        (np.ones(2 * len(src), dtype=np.int32), (np.r_[src, dst], np.r_[dst, src])),
+        shape=(n, n),
+    )
+    # Parallel edges collapse into one neighbour
+    adjacency.data[:] = 1
+    degree = np.diff(adjacency.indptr)
+
+    stored = session.nodes if isinstance(session.nodes, StoredNodes) else None
+    if stored is not None and stored.community is not None:
+        community, x, y = np.asarray(stored.community), np.asarray(stored.x), np.asarray(stored.y)
+    elif n:
+        community = _label_propagation(adjacency)
+        x, y = _layout(community, degree, src, dst)
+    else:
+        community = np.zeros(0, dtype=np.int64)
+        x = y = np.zeros(0, dtype=np.float32)
+
+    return GraphView(
+        community=community, x=x, y=y, degree=degree, types=types,
+        adjacency=adjacency, edge_source=src, edge_target=dst,
+        ids=ids, index=index,
+    )
+
+
+def get_view(session: GraphSession) -> GraphView:
+    if session.view is None:
+        session.view = build_view(session)
+    return session.view
+
+
+def _row_of(session: GraphSession, view: GraphView, node_id: str) -> Optional[int]:
+    if view.index is not None:
+        return view.index.get(node_id)
+    return session.nodes.row_of(node_id)
+
+
+def _node_at(session: GraphSession, view: GraphView, row: int) -> Node:
+    if view.ids is not None:
+        return session.nodes[view.ids[row]]
+    return session.nodes.node_at(row)
+
+
+def _node_payload(session: GraphSession, view: GraphView, row: int) -> dict:
+    payload = _node_at(session, view, row).to_dict()
+    payload["x"] = float(view.x[row])
+    payload["y"] = float(view.y[row])
+    payload["cluster_id"] = int(view.community[row])
+    return payload
+
+
+def _page(session: GraphSession, view: GraphView, rows: np.ndarray, offset: int, limit: int) -> dict:
+    """Page through an ordered row list.
+
+    A page carries the edges between its own nodes and every node of earlier
+    pages, so a client that accumulates pages ends up with the induced subgraph
+    and never receives an edge twice.
+    """
+    n = len(view.community)
+    page = rows[offset:offset + limit]
+    seen = np.zeros(n, dtype=bool)
+    seen[rows[:offset + limit]] = True
+    current = np.zeros(n, dtype=bool)
+    current[page] = True
+    src, dst = view.edge_source, view.edge_target
+    edge_rows = np.flatnonzero(seen[src] & seen[dst] & (current[src] | current[dst]))
+    next_offset = offset + limit if offset + limit < len(rows) else None
+    return {
+        "nodes": [_node_payload(session, view, int(r)) for r in page],
+        "edges": [session.edges[int(i)].to_dict() for i in edge_rows],
+        "total": int(len(rows)),
+        "offset": offset,
+        "next_offset": next_offset,
+    }
+
+
+def summary(session: GraphSession, max_clusters: int = 200) -> dict:
+    """Community super-nodes with member counts, plus weighted inter-community edges."""
+    view = get_view(session)
+    community = view.community
+    sizes = np.bincount(community) if len(community) else np.zeros(0, dtype=np.int64)
+    k = min(len(sizes), max_clusters)
+
+    shown = community < k
+    type_counts = np.zeros((k, len(_ENTITY_TYPES)), dtype=np.int64)
+    np.add.at(type_counts, (community[shown], view.types[shown]), 1)
+    cx = np.bincount(community, weights=view.x, minlength=k)[:k] / np.maximum(sizes[:k], 1)
+    cy = np.bincount(community, weights=view.y, minlength=k)[:k] / np.maximum(sizes[:k], 1)
+    # Highest-degree member names the community
+    order = np.lexsort((-view.degree, community))
+    hubs = order[np.r_[0, np.cumsum(sizes)[:-1]]][:k] if k else []
+
+    cs, cd = community[view.edge_source], community[view.edge_target]
+    keep = (cs != cd) & (cs < k) & (cd < k)
+    pairs, weight = np.unique(np.sort(np.stack([cs[keep], cd[keep]], axis=1), axis=1), axis=0, return_counts=True)
+    external = np.bincount(pairs.ravel(), weights=np.repeat(weight, 2), minlength=k)
+
+    nodes = []
+    for c in range(k):
+        hub = _node_at(session, view, int(hubs[c]))
+        entity_type = _ENTITY_TYPES[int(type_counts[c].argmax())]
+        count = int(sizes[c])
+        nodes.append({
+            "id": f"cluster:{c}",
+            "label": hub.label if count == 1 else f"{hub.label} +{count - 1}",
+            "type": entity_type.value,
+            "description": f"{count} entities around {hub.label}",
+            "color": ENTITY_COLORS.get(entity_type, "#3a7bd5"),
+            "source_doc": "",
+            "connection_count": int(external[c]),
+            "x": float(cx[c]),
+            "y": float(cy[c]),
+            "cluster_id": c,
+            "count": count,
+            "is_cluster": True,
+        })
+
+    edges = [
+        {
+            "id": f"cluster:{a}-cluster:{b}",
+            "source": f"cluster:{a}",
+            "target": f"cluster:{b}",
+            "label": f"{w} links",
+            "source_sentence": "",
+            "weight": int(w),
+        }
+        for (a, b), w in zip(pairs.tolist(), weight.tolist())
+    ]
+
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "total_nodes": len(community),
+        "total_edges": len(view.edge_source),
+        "total_clusters": int(len(sizes)),
+        "hidden_nodes": int(len(community) - shown.sum()),
+    }
+
+
+def cluster_members(session: GraphSession, cluster_id: int, offset: int = 0, limit: int = 500) -> dict:
+    view = get_view(session)
+    rows = np.flatnonzero(view.community == cluster_id)
+    rows = rows[np.argsort(-view.degree[rows], kind="stable")]
+    return _page(session, view, rows, offset, limit)
+
+
+def neighborhood(
+    session: GraphSession,
+    node_ids: List[str],
+    hops: int = 1,
+    offset: int = 0,
+    limit: int = 500,
+) -> Optional[dict]:
+    """k-hop neighbourhood of the seed nodes, nearest hop first, hubs first within a hop."""
+    view = get_view(session)
+    seeds = [_row_of(session, view, nid) for nid in node_ids]
+    seeds = np.unique([r for r in seeds if r is not None]).astype(np.int64)
+    if not len(seeds):
+        return None
+
+    visited = np.zeros(len(view.community), dtype=bool)
+    visited[seeds] = True
+    layers = [seeds]
+    frontier = seeds
+    for _ in range(hops):
+        reached = np.unique(view.adjacency[frontier].indices)
+        frontier = reached[~visited[reached]]
+        if not len(frontier):
+            break
+        visited[frontier] = True
+        layers.append(frontier)
+
+    rows = np.concatenate([layer[np.argsort(-view.degree[layer], kind="stable")] for layer in layers])
+    result = _page(session, view, rows, offset, limit)
+    bounds = np.cumsum([len(layer) for layer in layers])
+    for i, node in enumerate(result["nodes"]):
+        node["hop"] = int(np.searchsorted(bounds, offset + i, side="right"))
+    return result
+
+
+def graph_payload(session: GraphSession) -> dict:
+    """Full graph with coordinates for small sessions, just counts for large ones."""
+    n = len(session.nodes)
+    if n > FULL_GRAPH_LIMIT:
+        return {
+            "session_id": session.session_id,
+            "nodes": [],
+            "edges": [],
+            "documents": session.documents,
+            "lod": True,
+            "total_nodes": n,
+            "total_edges": len(session.edges),
+        }
+    view = get_view(session)
+    return {
+        "session_id": session.session_id,
+        "nodes": [_node_payload(session, view, row) for row in range(n)],
+        "edges": [e.to_dict() for e in session.edges],
+        "documents": session.documents,
+        "lod": False,
+        "total_nodes": n,
+        "total_edges": len(session.edges),
+    }
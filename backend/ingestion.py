@@ -9,6 +9,8 @@ import numpy as np
 
 from models import Node, Edge, EntityType, GraphSession
 from session import store
+from persistence import save_session
+import graph_view
 
 XAI_BASE_URL = "https://api.x.ai/v1"
 GROK_MODEL = "grok-4"
@@ -86,9 +88,11 @@ def compute_embeddings(session: GraphSession):
     node_ids = list(session.nodes.keys())
 
     vectorizer = TfidfVectorizer(max_features=512, stop_words='english')
-    matrix = vectorizer.fit_transform(texts).toarray()
+    sparse_matrix = vectorizer.fit_transform(texts)
+    matrix = sparse_matrix.toarray()
 
     session.vectorizer = vectorizer
+    session.embeddings = sparse_matrix
     for i, node_id in enumerate(node_ids):
         session.nodes[node_id].embedding = matrix[i].tolist()
 
@@ -123,12 +127,15 @@ async def ingest_document(
     api_key: str,
 ):
     session = store.get_or_create(session_id)
-    # Reset session state for fresh ingestion
-    session.nodes.clear()
-    session.edges.clear()
-    session.documents.clear()
-    session.label_to_id.clear()
+    # Reset session state for fresh ingestion. Containers are replaced rather
+    # than cleared since a session opened from disk holds read-only views.
+    session.nodes = {}
+    session.edges = []
+    session.documents = []
+    session.label_to_id = {}
     session.vectorizer = None
+    session.embeddings = None
+    session.view = None
 
     client = AsyncOpenAI(api_key=api_key, base_url=XAI_BASE_URL)
 
@@ -234,6 +241,17 @@ async def ingest_document(
             total_edges += 1
 
     compute_embeddings(session)
+    # Communities and layout are computed once here rather than per request.
+    # Always rebuild: a request made mid-ingestion may have cached a view of
+    # the still-empty graph.
+    session.view = await asyncio.to_thread(graph_view.build_view, session)
+    graph = graph_view.graph_payload(session)
+
+    # Persist so the graph survives restarts; a failed write only costs warm start
+    try:
+        await asyncio.to_thread(save_session, session)
+    except (OSError, ValueError):
+        pass
 
     await store.broadcast(session_id, {
         "event": "ingestion_complete",
@@ -242,6 +260,7 @@ async def ingest_document(
             "relationships": total_edges,
             "chunks_processed": total_chunks,
         },
-        "nodes": [n.to_dict() for n in session.nodes.values()],
-        "edges": [e.to_dict() for e in session.edges],
+        "nodes": graph["nodes"],
+        "edges": graph["edges"],
+        "lod": graph["lod"],
     })
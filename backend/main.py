@@ -3,7 +3,8 @@ import uuid
 import asyncio
 from pathlib import Path
 from dotenv import load_dotenv
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException
+from typing import List
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
@@ -14,6 +15,8 @@ load_dotenv(Path(__file__).parent.parent / ".env")
 from session import store
 from ingestion import ingest_document
 from query_engine import run_query
+import graph_view
+import persistence
 
 app = FastAPI(title="Synapse API")
 
@@ -27,6 +30,9 @@ app.add_middleware(
 
 FRONTEND_DIST = Path(__file__).parent.parent / "frontend" / "dist"
 
+# Nothing can be saving yet, so leftovers from a crashed save are safe to clear
+persistence.remove_stale_temp_dirs()
+
 def get_api_key() -> str:
     return os.environ.get("XAI_API_KEY", "")
 
@@ -40,10 +46,75 @@ async def create_session():
 
 @app.get("/session/{session_id}")
 async def get_session(session_id: str):
+    session = store.get(session_id) or store.open(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    # Large graphs come back as counts only; browse them via /graph/{session_id}/...
+    return await asyncio.to_thread(graph_view.graph_payload, session)
+
+
+@app.post("/session/{session_id}/save")
+async def save_session(session_id: str):
     session = store.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    return session.to_dict()
+    try:
+        await asyncio.to_thread(store.save, session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "saved", "session_id": session_id}
+
+
+@app.post("/session/{session_id}/open")
+async def open_session(session_id: str):
+    session = store.open(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Stored graph not found")
+    return {
+        "session_id": session_id,
+        "nodes": len(session.nodes),
+        "edges": len(session.edges),
+        "documents": session.documents,
+    }
+
+
+def _require_graph(session_id: str):
+    session = store.get(session_id) or store.open(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+
+@app.get("/graph/{session_id}/summary")
+async def graph_summary(session_id: str, max_clusters: int = Query(200, ge=1, le=2000)):
+    session = _require_graph(session_id)
+    return await asyncio.to_thread(graph_view.summary, session, max_clusters)
+
+
+@app.get("/graph/{session_id}/cluster/{cluster_id}")
+async def graph_cluster(
+    session_id: str,
+    cluster_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+):
+    session = _require_graph(session_id)
+    return await asyncio.to_thread(graph_view.cluster_members, session, cluster_id, offset, limit)
+
+
+@app.get("/graph/{session_id}/neighborhood")
+async def graph_neighborhood(
+    session_id: str,
+    node_id: List[str] = Query(...),
+    hops: int = Query(1, ge=0, le=4),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+):
+    session = _require_graph(session_id)
+    page = await asyncio.to_thread(graph_view.neighborhood, session, node_id, hops, offset, limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    return page
 
 
 @app.post("/upload/{session_id}")
@@ -71,7 +142,7 @@ async def query(session_id: str, body: dict):
     if not q:
         raise HTTPException(status_code=400, detail="Query cannot be empty")
 
-    session = store.get(session_id)
+    session = store.get(session_id) or store.open(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -96,7 +167,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         if session and session.nodes:
             await websocket.send_json({
                 "event": "graph_state",
-                "graph": session.to_dict(),
+                "graph": await asyncio.to_thread(graph_view.graph_payload, session),
             })
 
         # Keep alive
@@ -73,6 +73,10 @@ class GraphSession:
     documents: List[str] = field(default_factory=list)
     label_to_id: Dict[str, str] = field(default_factory=dict)
     vectorizer: Optional[Any] = field(default=None, repr=False)
+    # Row i holds the embedding of the i-th node in `nodes` iteration order
+    embeddings: Optional[Any] = field(default=None, repr=False)
+    # Cached communities, layout and adjacency (see graph_view.py)
+    view: Optional[Any] = field(default=None, repr=False)
 
     def to_dict(self):
         return {
@@ -0,0 +1,429 @@
+"""Compact on-disk format for graph sessions.
+
+A stored graph is a directory holding one ``meta.json`` plus a set of ``.npy``
+columns. Strings live in UTF-8 blobs indexed by int64 offset arrays, node and
+edge ids are fixed-width byte arrays with a sorted index for lookup, and the
+TF-IDF embeddings are kept as a CSR matrix. Every array is opened with
+``mmap_mode="r"`` so loading only touches the header; pages are faulted in as
+nodes, edges and embedding rows are actually read.
+"""
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from models import Node, Edge, EntityType, GraphSession
+
+FORMAT_VERSION = 1
+
+GRAPH_DIR = Path(os.environ.get(
+    "SYNAPSE_GRAPH_DIR",
+    Path(__file__).parent.parent / "data" / "graphs",
+))
+
+_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+_ENTITY_TYPES = list(EntityType)
+
+# Saves run in worker threads; only the final directory swap needs to be exclusive
+_swap_lock = threading.Lock()
+
+
+def _write_strings(directory: Path, name: str, values: Iterable[str]):
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    np.save(directory / f"{name}_offsets.npy", offsets)
+    np.save(directory / f"{name}_blob.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+
+def _write_ids(directory: Path, name: str, ids: List[str]):
+    encoded = np.array([i.encode("utf-8") for i in ids], dtype=bytes)
+    if encoded.dtype.itemsize == 0:
+        encoded = encoded.astype("S1")
+    order = np.argsort(encoded, kind="stable")
+    np.save(directory / f"{name}_ids.npy", encoded)
+    np.save(directory / f"{name}_ids_sorted.npy", encoded[order])
+    np.save(directory / f"{name}_ids_rows.npy", order.astype(np.int64))
+
+
+def _load(directory: Path, name: str) -> np.ndarray:
+    return np.load(directory / f"{name}.npy", mmap_mode="r")
+
+
+class _StringColumn:
+    def __init__(self, directory: Path, name: str):
+        self._offsets = _load(directory, f"{name}_offsets")
+        self._blob = _load(directory, f"{name}_blob")
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+
+class _IdColumn:
+    def __init__(self, directory: Path, name: str):
+        self._ids = _load(directory, f"{name}_ids")
+        self._sorted = _load(directory, f"{name}_ids_sorted")
+        self._rows = _load(directory, f"{name}_ids_rows")
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, i: int) -> str:
+        return self._ids[i].decode("utf-8")
+
+    def row_of(self, key: str) -> int | None:
+        encoded = key.encode("utf-8")
+        if len(encoded) > self._sorted.dtype.itemsize:
+            return None
+        pos = int(np.searchsorted(self._sorted, encoded))
+        if pos < len(self._sorted) and self._sorted[pos] == encoded:
+            return int(self._rows[pos])
+        return None
+
+
+class StoredNodes(Mapping):
+    """Read-only ``Dict[str, Node]`` backed by memory-mapped columns.
+
+    Nodes are materialised on first access and cached. ``Node.embedding`` is
+    left empty; the embedding rows live in ``GraphSession.embeddings``.
+    """
+
+    def __init__(self, directory: Path, source_docs: List[str], has_layout: bool = False):
+        self._ids = _IdColumn(directory, "node")
+        self._labels = _StringColumn(directory, "node_label")
+        self._descriptions = _StringColumn(directory, "node_description")
+        self._types = _load(directory, "node_type")
+        self._docs = _load(directory, "node_doc")
+        self._counts = _load(directory, "node_connection_count")
+        self._source_docs = source_docs
+        self._cache: Dict[int, Node] = {}
+        # Community / coordinate columns written alongside a computed graph view
+        self.community = _load(directory, "node_community") if has_layout else None
+        self.x = _load(directory, "node_x") if has_layout else None
+        self.y = _load(directory, "node_y") if has_layout else None
+
+    @property
+    def type_codes(self) -> np.ndarray:
+        return self._types
+
+    def row_of(self, key: str) -> int | None:
+        return self._ids.row_of(key)
+
+    def node_at(self, row: int) -> Node:
+        node = self._cache.get(row)
+        if node is None:
+            doc = int(self._docs[row])
+            node = Node(
+                id=self._ids[row],
+                label=self._labels[row],
+                type=_ENTITY_TYPES[self._types[row]],
+                description=self._descriptions[row],
+                source_doc=self._source_docs[doc] if doc >= 0 else "",
+                connection_count=int(self._counts[row]),
+            )
+            self._cache[row] = node
+        return node
+
+    def __getitem__(self, key: str) -> Node:
+        row = self._ids.row_of(key)
+        if row is None:
+            raise KeyError(key)
+        return self.node_at(row)
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self._ids.row_of(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(len(self._ids)):
+            yield self._ids[row]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def values(self):
+        return (self.node_at(row) for row in range(len(self._ids)))
+
+
+class StoredEdges(Sequence):
+    """Read-only ``List[Edge]`` backed by memory-mapped columns."""
+
+    def __init__(self, directory: Path, node_ids: _IdColumn):
+        self._ids = _IdColumn(directory, "edge")
+        self._node_ids = node_ids
+        self._sources = _load(directory, "edge_source")
+        self._targets = _load(directory, "edge_target")
+        self._label_codes = _load(directory, "edge_label_code")
+        self._labels = _StringColumn(directory, "edge_label")
+        self._sentences = _StringColumn(directory, "edge_sentence")
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return Edge(
+            id=self._ids[i],
+            source_id=self._node_ids[int(self._sources[i])],
+            target_id=self._node_ids[int(self._targets[i])],
+            label=self._labels[int(self._label_codes[i])],
+            source_sentence=self._sentences[i],
+        )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def source_rows(self) -> np.ndarray:
+        return self._sources
+
+    @property
+    def target_rows(self) -> np.ndarray:
+        return self._targets
+
+
+class _LabelIndex(Mapping):
+    """``label.lower() -> node id``, built from the stored labels on first use."""
+
+    def __init__(self, nodes: StoredNodes):
+        self._nodes = nodes
+        self._index: Dict[str, str] | None = None
+
+    def _built(self) -> Dict[str, str]:
+        if self._index is None:
+            labels, ids = self._nodes._labels, self._nodes._ids
+            self._index = {labels[i].lower(): ids[i] for i in range(len(ids))}
+        return self._index
+
+    def __getitem__(self, key: str) -> str:
+        return self._built()[key]
+
+    def __iter__(self):
+        return iter(self._built())
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+
+def graph_path(session_id: str) -> Path | None:
+    """Directory for a stored session, or None if the id is not path-safe."""
+    if not _SESSION_ID_RE.match(session_id):
+        return None
+    return GRAPH_DIR / session_id
+
+
+def _old_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.old")
+
+
+def _recover(path: Path):
+    """Finish a swap interrupted between moving the old graph aside and moving the new one in."""
+    old = _old_path(path)
+    if (path / "meta.json").is_file() or not (old / "meta.json").is_file():
+        return
+    with _swap_lock:
+        if not path.exists() and (old / "meta.json").is_file():
+            old.rename(path)
+
+
+def exists(session_id: str) -> bool:
+    path = graph_path(session_id)
+    if path is None:
+        return False
+    _recover(path)
+    return (path / "meta.json").is_file()
+
+
+def remove_stale_temp_dirs():
+    """Clean up after saves interrupted by a crash.
+
+    Only safe before any save can be running, i.e. at startup: in-flight saves
+    keep their half-written data in the same ``.<id>.*.tmp`` directories.
+    """
+    if not GRAPH_DIR.is_dir():
+        return
+    for tmp in GRAPH_DIR.glob(".*.tmp"):
+        shutil.rmtree(tmp, ignore_errors=True)
+    for old in GRAPH_DIR.glob(".*.old"):
+        _recover(old.with_name(old.name[1:-len(".old")]))
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _embedding_matrix(session: GraphSession, nodes: List[Node]) -> sparse.csr_matrix:
+    if session.embeddings is not None:
+        return sparse.csr_matrix(session.embeddings, dtype=np.float32)
+    rows = [n.embedding for n in nodes]
+    width = max((len(r) for r in rows), default=0)
+    dense = np.zeros((len(rows), width), dtype=np.float32)
+    for i, row in enumerate(rows):
+        dense[i, :len(row)] = row
+    return sparse.csr_matrix(dense)
+
+
+def _vectorizer_params(vectorizer: TfidfVectorizer) -> dict:
+    params = {}
+    for key, value in vectorizer.get_params().items():
+        if isinstance(value, tuple):
+            value = list(value)
+        if value is None or isinstance(value, (str, int, float, bool, list)):
+            params[key] = value
+    return params
+
+
+def _layout_columns(session: GraphSession):
+    """Community and coordinates per node row, from the view or the stored columns."""
+    if session.view is not None:
+        return session.view.community, session.view.x, session.view.y
+    # An opened graph whose view hasn't been built yet still carries its layout
+    nodes = session.nodes
+    if isinstance(nodes, StoredNodes) and nodes.community is not None:
+        return nodes.community, nodes.x, nodes.y
+    return None
+
+
+def _write_session(session: GraphSession, tmp: Path):
+    nodes = list(session.nodes.values())
+    edges = list(session.edges)
+    row_of = {n.id: i for i, n in enumerate(nodes)}
+    doc_codes: Dict[str, int] = {}
+    for n in nodes:
+        if n.source_doc:
+            doc_codes.setdefault(n.source_doc, len(doc_codes))
+
+    _write_ids(tmp, "node", [n.id for n in nodes])
+    _write_strings(tmp, "node_label", (n.label for n in nodes))
+    _write_strings(tmp, "node_description", (n.description for n in nodes))
+    np.save(tmp / "node_type.npy", np.array([_ENTITY_TYPES.index(n.type) for n in nodes], dtype=np.uint8))
+    np.save(tmp / "node_doc.npy", np.array([doc_codes.get(n.source_doc, -1) for n in nodes], dtype=np.int32))
+    np.save(tmp / "node_connection_count.npy", np.array([n.connection_count for n in nodes], dtype=np.int32))
+
+    # Relationship labels repeat heavily ("defines", "uses", ...), so they are
+    # dictionary-encoded rather than stored per edge.
+    edge_labels: Dict[str, int] = {}
+    label_codes = [edge_labels.setdefault(e.label, len(edge_labels)) for e in edges]
+    _write_ids(tmp, "edge", [e.id for e in edges])
+    np.save(tmp / "edge_source.npy", np.array([row_of[e.source_id] for e in edges], dtype=np.int32))
+    np.save(tmp / "edge_target.npy", np.array([row_of[e.target_id] for e in edges], dtype=np.int32))
+    np.save(tmp / "edge_label_code.npy", np.array(label_codes, dtype=np.int32))
+    _write_strings(tmp, "edge_label", edge_labels)
+    _write_strings(tmp, "edge_sentence", (e.source_sentence for e in edges))
+
+    matrix = _embedding_matrix(session, nodes)
+    np.save(tmp / "embedding_data.npy", matrix.data.astype(np.float32))
+    np.save(tmp / "embedding_indices.npy", matrix.indices.astype(np.int32))
+    np.save(tmp / "embedding_indptr.npy", matrix.indptr.astype(np.int64))
+
+    layout = _layout_columns(session)
+    if layout is not None:
+        community, x, y = layout
+        np.save(tmp / "node_community.npy", np.asarray(community, dtype=np.int32))
+        np.save(tmp / "node_x.npy", np.asarray(x, dtype=np.float32))
+        np.save(tmp / "node_y.npy", np.asarray(y, dtype=np.float32))
+
+    vectorizer = None
+    if session.vectorizer is not None:
+        _write_strings(tmp, "vocabulary", session.vectorizer.get_feature_names_out().tolist())
+        np.save(tmp / "idf.npy", session.vectorizer.idf_.astype(np.float64))
+        vectorizer = _vectorizer_params(session.vectorizer)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "session_id": session.session_id,
+        "documents": list(session.documents),
+        "source_docs": list(doc_codes),
+        "entity_types": [t.value for t in _ENTITY_TYPES],
+        "node_count": len(nodes),
+        "edge_count": len(edges),
+        "embedding_shape": list(matrix.shape),
+        "vectorizer": vectorizer,
+        "layout": layout is not None,
+    }
+    (tmp / "meta.json").write_text(json.dumps(meta))
+
+
+def save_session(session: GraphSession, path: Path | None = None) -> Path:
+    """Write ``session`` to ``path`` (default: ``GRAPH_DIR/<session_id>``).
+
+    The graph is written to a uniquely named ``.<id>.*.tmp`` sibling and then
+    swapped in, so overlapping saves of one session never touch each other's
+    files and the last one to finish wins. The previous graph is moved to
+    ``.<id>.old`` during the swap; if a crash lands in between, the next open
+    moves it back. A crash mid-write leaves the previous graph untouched and
+    a stale temp directory for ``remove_stale_temp_dirs`` to clean up.
+    """
+    path = path or graph_path(session.session_id)
+    if path is None:
+        raise ValueError(f"Invalid session id: {session.session_id!r}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"))
+    try:
+        _write_session(session, tmp)
+        with _swap_lock:
+            old = _old_path(path)
+            shutil.rmtree(old, ignore_errors=True)
+            if path.exists():
+                path.rename(old)
+            tmp.rename(path)
+            shutil.rmtree(old, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return path
+
+
+def _load_vectorizer(path: Path, params: dict) -> TfidfVectorizer:
+    if isinstance(params.get("ngram_range"), list):
+        params["ngram_range"] = tuple(params["ngram_range"])
+    vectorizer = TfidfVectorizer(**params)
+    terms = _StringColumn(path, "vocabulary")
+    vectorizer.vocabulary_ = {terms[i]: i for i in range(len(terms))}
+    vectorizer.idf_ = np.load(path / "idf.npy")
+    return vectorizer
+
+
+def load_session(path: Path) -> GraphSession:
+    """Open a stored graph. Columns are memory-mapped, not read into memory."""
+    _recover(path)
+    meta = json.loads((path / "meta.json").read_text())
+    if meta.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported graph format version: {meta.get('version')}")
+    if meta["entity_types"] != [t.value for t in _ENTITY_TYPES]:
+        raise ValueError("Stored graph uses a different entity type set")
+
+    nodes = StoredNodes(path, meta["source_docs"], meta.get("layout", False))
+    edges = StoredEdges(path, nodes._ids)
+
+    embeddings = sparse.csr_matrix(
+        (_load(path, "embedding_data"), _load(path, "embedding_indices"), _load(path, "embedding_indptr")),
+        shape=tuple(meta["embedding_shape"]),
+        copy=False,
+    )
+
+    vectorizer = None
+    if meta["vectorizer"] is not None:
+        vectorizer = _load_vectorizer(path, meta["vectorizer"])
+
+    return GraphSession(
+        session_id=meta["session_id"],
+        nodes=nodes,
+        edges=edges,
+        documents=meta["documents"],
+        label_to_id=_LabelIndex(nodes),
+        vectorizer=vectorizer,
+        embeddings=embeddings,
+    )
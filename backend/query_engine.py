@@ -26,7 +26,9 @@ def score_nodes(query: str, session: GraphSession) -> Dict[str, float]:
         return {}
 
     node_ids = list(session.nodes.keys())
-    node_embeddings = np.array([session.nodes[nid].embedding for nid in node_ids])
+    node_embeddings = session.embeddings
+    if node_embeddings is None:
+        node_embeddings = np.array([session.nodes[nid].embedding for nid in node_ids])
 
     # Transform query into the same feature space as the stored node embeddings
     query_vec = session.vectorizer.transform([query]).toarray()[0].reshape(1, -1)
@@ -85,7 +87,7 @@ def build_context(session: GraphSession, node_ids: List[str]) -> str:
 
 
 async def run_query(session_id: str, query: str, api_key: str):
-    session = store.get(session_id)
+    session = store.get(session_id) or store.open(session_id)
     if not session:
         await store.broadcast(session_id, {"event": "error", "message": "Session not found"})
         return
@@ -1,6 +1,7 @@
 from typing import Dict, Set
 from fastapi import WebSocket
 from models import GraphSession
+import persistence
 
 
 class SessionStore:
@@ -19,9 +20,32 @@ class SessionStore:
 
     def get_or_create(self, session_id: str) -> GraphSession:
         if session_id not in self._sessions:
-            return self.create(session_id)
+            return self.open(session_id) or self.create(session_id)
         return self._sessions[session_id]
 
+    def open(self, session_id: str) -> GraphSession | None:
+        """Return the live session, or load the stored graph into memory.
+
+        A live session is never replaced: an ingestion may still be writing
+        into it, and it holds the cached graph view.
+        """
+        if session_id in self._sessions:
+            return self._sessions[session_id]
+        if not persistence.exists(session_id):
+            return None
+        session = persistence.load_session(persistence.graph_path(session_id))
+        session.session_id = session_id
+        self._sessions[session_id] = session
+        self._connections.setdefault(session_id, set())
+        return session
+
+    def save(self, session_id: str) -> bool:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return False
+        persistence.save_session(session)
+        return True
+
     def add_connection(self, session_id: str, ws: WebSocket):
         if session_id not in self._connections:
             self._connections[session_id] = set()
@@ -0,0 +1,33 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+import main
+import persistence
+from models import Node, EntityType
+from session import store
+
+
+def test_query_opens_stored_graph(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, "GRAPH_DIR", tmp_path)
+    monkeypatch.setenv("XAI_API_KEY", "test-key")
+    queried = []
+
+    async def run_query(session_id, query, api_key):
+        queried.append((session_id, query))
+
+    monkeypatch.setattr(main, "run_query", run_query)
+
+    session = store.create("stored-query")
+    node_id = str(uuid.uuid4())
+    session.nodes[node_id] = Node(id=node_id, label="Alpha", type=EntityType.ORG, description="")
+    store.save("stored-query")
+    # Simulate a restart: nothing is live in memory any more
+    store._sessions.pop("stored-query")
+
+    client = TestClient(main.app)
+    response = client.post("/query/stored-query", json={"query": "alpha"})
+
+    assert response.status_code == 200
+    assert store.get("stored-query") is not None
+    assert queried == [("stored-query", "alpha")]
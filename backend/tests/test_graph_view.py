@@ -0,0 +1,212 @@
+import itertools
+import uuid
+
+import numpy as np
+from scipy import sparse
+
+import graph_view
+import persistence
+from models import Node, Edge, EntityType, GraphSession
+
+
+def _edgeless_session(count: int) -> GraphSession:
+    session = GraphSession(session_id="edgeless")
+    for i in range(count):
+        node_id = str(uuid.uuid4())
+        session.nodes[node_id] = Node(id=node_id, label=f"node {i}", type=EntityType.CONCEPT, description="")
+    return session
+
+
+def test_edgeless_graph_gets_one_community_per_node():
+    session = _edgeless_session(2)
+    view = graph_view.get_view(session)
+
+    assert sorted(view.community.tolist()) == [0, 1]
+    assert len(view.x) == len(view.y) == 2
+
+
+def test_edgeless_graph_payloads():
+    session = _edgeless_session(3)
+
+    payload = graph_view.graph_payload(session)
+    assert not payload["lod"]
+    assert len(payload["nodes"]) == 3
+    assert payload["edges"] == []
+
+    summary = graph_view.summary(session)
+    assert [n["count"] for n in summary["nodes"]] == [1, 1, 1]
+    assert summary["edges"] == []
+
+    page = graph_view.neighborhood(session, [next(iter(session.nodes))], hops=2)
+    assert page["total"] == 1
+    assert page["edges"] == []
+
+
+def _bridged_session() -> GraphSession:
+    """A 6-clique and a 4-clique joined by two edges into b0, plus an isolated node."""
+    session = GraphSession(session_id="bridged")
+    groups = {
+        EntityType.CONCEPT: [f"a{i}" for i in range(6)],
+        EntityType.PERSON: [f"b{i}" for i in range(4)],
+        EntityType.ORG: ["lonely"],
+    }
+    for entity_type, labels in groups.items():
+        for label in labels:
+            session.nodes[label] = Node(id=label, label=label, type=entity_type, description="")
+    pairs = (
+        list(itertools.combinations(groups[EntityType.CONCEPT], 2))
+        + list(itertools.combinations(groups[EntityType.PERSON], 2))
+        + [("a0", "b0"), ("a1", "b0")]
+    )
+    for source, target in pairs:
+        session.edges.append(Edge(id=f"{source}-{target}", source_id=source, target_id=target, label="r"))
+    return session
+
+
+def _fixed_communities(monkeypatch):
+    # Label propagation on a graph this small may merge the cliques across the
+    # bridge; pin the assignment so the summary maths can be checked exactly.
+    communities = np.array([0] * 6 + [1] * 4 + [2])
+    monkeypatch.setattr(graph_view, "_label_propagation", lambda adjacency: communities)
+
+
+def _hops_from(session: GraphSession, seed: str, max_hops: int) -> dict:
+    neighbours = {nid: set() for nid in session.nodes}
+    for e in session.edges:
+        neighbours[e.source_id].add(e.target_id)
+        neighbours[e.target_id].add(e.source_id)
+    hops, frontier = {seed: 0}, [seed]
+    for _ in range(max_hops):
+        reached = []
+        for node_id in frontier:
+            for neighbour in neighbours[node_id]:
+                if neighbour not in hops:
+                    hops[neighbour] = hops[node_id] + 1
+                    reached.append(neighbour)
+        frontier = reached
+    return hops
+
+
+def _accumulate(fetch):
+    nodes, edges, pages, offset = [], [], [], 0
+    while offset is not None:
+        page = fetch(offset)
+        pages.append(page)
+        nodes += page["nodes"]
+        edges += [e["id"] for e in page["edges"]]
+        offset = page["next_offset"]
+    return nodes, edges, pages
+
+
+def _induced(session: GraphSession, node_ids) -> set:
+    node_ids = set(node_ids)
+    return {e.id for e in session.edges if e.source_id in node_ids and e.target_id in node_ids}
+
+
+def test_label_propagation_numbers_communities_by_size():
+    # Disconnected cliques of 3, 5 and 2 nodes plus an isolated node
+    pairs, offset = [], 0
+    for size in (3, 5, 2):
+        pairs += itertools.combinations(range(offset, offset + size), 2)
+        offset += size
+    src, dst = np.array(pairs).T
+    adjacency = sparse.csr_matrix(
+        (np.ones(2 * len(src)), (np.r_[src, dst], np.r_[dst, src])),
+        shape=(offset + 1, offset + 1),
+    )
+
+    community = graph_view._label_propagation(adjacency)
+
+    assert community.tolist() == [1] * 3 + [0] * 5 + [2] * 2 + [3]
+
+
+def test_summary_sizes_hubs_and_weights(monkeypatch):
+    _fixed_communities(monkeypatch)
+    session = _bridged_session()
+
+    summary = graph_view.summary(session)
+
+    assert summary["total_nodes"] == 11
+    assert summary["total_edges"] == len(session.edges)
+    assert summary["total_clusters"] == 3
+    assert summary["hidden_nodes"] == 0
+    clusters = summary["nodes"]
+    assert [c["count"] for c in clusters] == [6, 4, 1]
+    # a0 and a1 tie on degree; the first row wins
+    assert [c["label"] for c in clusters] == ["a0 +5", "b0 +3", "lonely"]
+    assert [c["type"] for c in clusters] == ["CONCEPT", "PERSON", "ORG"]
+    assert [c["connection_count"] for c in clusters] == [2, 2, 0]
+    assert summary["edges"] == [{
+        "id": "cluster:0-cluster:1",
+        "source": "cluster:0",
+        "target": "cluster:1",
+        "label": "2 links",
+        "source_sentence": "",
+        "weight": 2,
+    }]
+
+    truncated = graph_view.summary(session, max_clusters=2)
+    assert len(truncated["nodes"]) == 2
+    assert truncated["hidden_nodes"] == 1
+
+
+def test_neighborhood_pages_form_induced_subgraph():
+    session = _bridged_session()
+    expected_hops = _hops_from(session, "a2", 2)
+
+    nodes, edges, pages = _accumulate(
+        lambda offset: graph_view.neighborhood(session, ["a2"], hops=2, offset=offset, limit=3)
+    )
+
+    assert len(pages) == 3
+    assert all(p["total"] == len(expected_hops) for p in pages)
+    assert [n["id"] for n in nodes][0] == "a2"
+    assert {n["id"]: n["hop"] for n in nodes} == expected_hops
+    hops = [n["hop"] for n in nodes]
+    assert hops == sorted(hops)
+    assert len(edges) == len(set(edges))
+    assert set(edges) == _induced(session, expected_hops)
+
+
+def test_neighborhood_limits_hops():
+    session = _bridged_session()
+
+    page = graph_view.neighborhood(session, ["a2"], hops=1)
+
+    assert {n["id"] for n in page["nodes"]} == {f"a{i}" for i in range(6)}
+    assert page["next_offset"] is None
+
+
+def test_cluster_members_paging(monkeypatch):
+    _fixed_communities(monkeypatch)
+    session = _bridged_session()
+
+    first = graph_view.cluster_members(session, 0, offset=0, limit=4)
+    assert first["total"] == 6
+    assert first["next_offset"] == 4
+    # Highest degree first
+    assert [n["id"] for n in first["nodes"]][:2] == ["a0", "a1"]
+
+    nodes, edges, pages = _accumulate(
+        lambda offset: graph_view.cluster_members(session, 0, offset=offset, limit=4)
+    )
+    assert pages[-1]["next_offset"] is None
+    assert sorted(n["id"] for n in nodes) == [f"a{i}" for i in range(6)]
+    assert len(edges) == len(set(edges))
+    assert set(edges) == _induced(session, [n["id"] for n in nodes])
+
+
+def test_stored_layout_is_reused(tmp_path, monkeypatch):
+    session = _bridged_session()
+    view = graph_view.get_view(session)
+    loaded = persistence.load_session(persistence.save_session(session, tmp_path / "g"))
+
+    def fail(adjacency):
+        raise AssertionError("layout should come from the stored columns")
+
+    monkeypatch.setattr(graph_view, "_label_propagation", fail)
+    stored = graph_view.get_view(loaded)
+
+    assert stored.community.tolist() == view.community.tolist()
+    assert np.allclose(stored.x, view.x) and np.allclose(stored.y, view.y)
+    assert graph_view.summary(loaded) == graph_view.summary(session)
@@ -0,0 +1,41 @@
+import asyncio
+
+import graph_view
+import ingestion
+import persistence
+from session import store
+
+
+def test_payload_requested_mid_ingestion_does_not_leave_stale_view(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, "GRAPH_DIR", tmp_path)
+    events = []
+    mid_ingestion = []
+
+    async def broadcast(session_id, data):
+        events.append(data)
+
+    async def extract(client, chunk, chunk_idx):
+        # A client polling the graph while extraction is still running
+        mid_ingestion.append(graph_view.graph_payload(store.get("mid-ingest")))
+        return chunk_idx, {
+            "entities": [
+                {"label": "Alpha", "type": "ORG", "description": "first"},
+                {"label": "Beta", "type": "TERM", "description": "second"},
+            ],
+            "relationships": [
+                {"source": "Alpha", "target": "Beta", "label": "uses", "sentence": "Alpha uses Beta."},
+            ],
+        }
+
+    monkeypatch.setattr(store, "broadcast", broadcast)
+    monkeypatch.setattr(ingestion, "_extract_chunk", extract)
+
+    text = ("Alpha uses Beta. " * 20).encode()
+    asyncio.run(ingestion.ingest_document("mid-ingest", text, "doc.txt", "key"))
+
+    assert mid_ingestion and mid_ingestion[0]["nodes"] == []
+    complete = events[-1]
+    assert complete["event"] == "ingestion_complete"
+    assert {n["label"] for n in complete["nodes"]} == {"Alpha", "Beta"}
+    assert len(complete["edges"]) == 1
+    assert persistence.exists("mid-ingest")
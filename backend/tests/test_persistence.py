@@ -0,0 +1,122 @@
+import threading
+import uuid
+
+import numpy as np
+import pytest
+
+import graph_view
+import persistence
+from ingestion import compute_embeddings
+from models import Node, Edge, EntityType, GraphSession
+from query_engine import bfs_traverse, score_nodes
+
+WORDS = ["graph", "memory", "vector", "layout", "cluster", "paging", "index", "query"]
+
+
+def _session(session_id: str, count: int) -> GraphSession:
+    session = GraphSession(session_id=session_id, documents=["doc.txt"])
+    ids = []
+    for i in range(count):
+        node_id = str(uuid.uuid4())
+        ids.append(node_id)
+        session.nodes[node_id] = Node(
+            id=node_id, label=f"node {i}", type=EntityType.TERM,
+            description=f"{WORDS[i % len(WORDS)]} {WORDS[(i * 3) % len(WORDS)]} of item {i}",
+            source_doc="doc.txt",
+        )
+        session.label_to_id[f"node {i}"] = node_id
+    for a, b in zip(ids, ids[1:]):
+        session.edges.append(Edge(id=str(uuid.uuid4()), source_id=a, target_id=b, label="uses"))
+    return session
+
+
+def test_round_trip(tmp_path):
+    session = _session("round-trip", 20)
+    loaded = persistence.load_session(persistence.save_session(session, tmp_path / "g"))
+
+    assert [n.to_dict() for n in loaded.nodes.values()] == [n.to_dict() for n in session.nodes.values()]
+    assert [e.to_dict() for e in loaded.edges] == [e.to_dict() for e in session.edges]
+    assert loaded.documents == ["doc.txt"]
+
+
+def test_round_trip_embeddings_and_retrieval(tmp_path):
+    session = _session("retrieval", 40)
+    compute_embeddings(session)
+    loaded = persistence.load_session(persistence.save_session(session, tmp_path / "g"))
+
+    assert dict(loaded.label_to_id) == session.label_to_id
+    assert loaded.vectorizer.vocabulary_ == session.vectorizer.vocabulary_
+    assert loaded.embeddings.shape == session.embeddings.shape
+
+    for query in ("graph memory", "cluster paging layout", "nothing relevant"):
+        expected = score_nodes(query, session)
+        scores = score_nodes(query, loaded)
+        assert scores.keys() == expected.keys()
+        assert all(scores[k] == pytest.approx(expected[k], abs=1e-6) for k in expected)
+
+    scores = score_nodes("graph memory", session)
+    seeds = sorted(scores, key=scores.get, reverse=True)[:3]
+    assert bfs_traverse(loaded, seeds, scores) == bfs_traverse(session, seeds, scores)
+
+
+def test_overlapping_saves_do_not_clobber_each_other(tmp_path):
+    path = tmp_path / "g"
+    sessions = [_session("same-id", 200) for _ in range(8)]
+    errors = []
+
+    def save(session):
+        try:
+            persistence.save_session(session, path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(s,)) for s in sessions]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    loaded = persistence.load_session(path)
+    assert list(loaded.nodes) in [list(s.nodes) for s in sessions]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["g"]
+
+
+def test_resave_keeps_stored_layout(tmp_path):
+    session = _session("layout", 30)
+    view = graph_view.get_view(session)
+    persistence.save_session(session, tmp_path / "g")
+
+    opened = persistence.load_session(tmp_path / "g")
+    assert opened.view is None
+    persistence.save_session(opened, tmp_path / "g")
+
+    reopened = persistence.load_session(tmp_path / "g")
+    assert reopened.nodes.community is not None
+    assert reopened.nodes.community.tolist() == view.community.tolist()
+    assert np.allclose(reopened.nodes.x, view.x) and np.allclose(reopened.nodes.y, view.y)
+
+
+def test_open_recovers_graph_from_interrupted_swap(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, "GRAPH_DIR", tmp_path)
+    session = _session("swapped", 10)
+    path = persistence.save_session(session)
+    # Crash after the old graph was moved aside but before the new one moved in
+    path.rename(tmp_path / ".swapped.old")
+
+    assert persistence.exists("swapped")
+    loaded = persistence.load_session(path)
+    assert list(loaded.nodes) == list(session.nodes)
+
+
+def test_remove_stale_temp_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, "GRAPH_DIR", tmp_path)
+    persistence.save_session(_session("kept", 5))
+    persistence.save_session(_session("moved", 5)).rename(tmp_path / ".moved.old")
+    (tmp_path / ".kept.abc123.tmp").mkdir()
+    (tmp_path / ".kept.old").mkdir()
+
+    persistence.remove_stale_temp_dirs()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["kept", "moved"]
+    assert persistence.exists("moved")
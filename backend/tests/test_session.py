@@ -0,0 +1,30 @@
+import uuid
+
+import persistence
+from models import Node, EntityType
+from session import SessionStore
+
+
+def test_open_keeps_live_session(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, "GRAPH_DIR", tmp_path)
+    store = SessionStore()
+    session = store.create("live")
+    node_id = str(uuid.uuid4())
+    session.nodes[node_id] = Node(id=node_id, label="a", type=EntityType.ORG, description="")
+    store.save("live")
+
+    assert store.open("live") is session
+
+
+def test_open_loads_stored_graph(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, "GRAPH_DIR", tmp_path)
+    store = SessionStore()
+    session = store.create("stored")
+    node_id = str(uuid.uuid4())
+    session.nodes[node_id] = Node(id=node_id, label="a", type=EntityType.ORG, description="")
+    store.save("stored")
+
+    fresh = SessionStore()
+    opened = fresh.open("stored")
+    assert opened is not None and list(opened.nodes) == [node_id]
+    assert fresh.open("missing") is None
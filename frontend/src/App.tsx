@@ -1,5 +1,8 @@
 import { useState, useCallback, useEffect, useRef } from 'react'
-import { GraphData, GraphNode, GraphEdge, SynapseEvent, AppPhase } from './types/graph'
+import {
+  GraphData, GraphNode, GraphEdge, SynapseEvent, AppPhase,
+  NodePayload, EdgePayload, GraphSummary, GraphPage,
+} from './types/graph'
 import { useWebSocket } from './hooks/useWebSocket'
 import GraphCanvas from './components/GraphCanvas'
 import UploadZone from './components/UploadZone'
@@ -10,6 +13,29 @@ import StatsOverlay from './components/StatsOverlay'
 
 const API = ''
 
+// Progressive reveal for small graphs: a fixed number of batched updates
+// instead of one timer (and one array copy) per node and edge
+const REVEAL_STEP_MS = 50
+
+const CLUSTER_PAGE_SIZE = 500
+
+// Large graphs arrive with server-computed coordinates, so nodes are pinned
+// there and the force simulation has nothing left to do
+function toGraphNode(n: NodePayload, pin: boolean): GraphNode {
+  return {
+    ...n,
+    score: 0,
+    isTraversed: false,
+    isRetrieved: false,
+    glowIntensity: 0,
+    ...(pin ? { fx: n.x, fy: n.y } : {}),
+  }
+}
+
+function toGraphEdge(e: EdgePayload): GraphEdge {
+  return { ...e, isTraversed: false, particleCount: 0 }
+}
+
 export default function App() {
   const [sessionId, setSessionId] = useState<string | null>(null)
   const [phase, setPhase] = useState<AppPhase>('idle')
@@ -18,6 +44,13 @@ export default function App() {
   // Graph data
   const [graphData, setGraphData] = useState<GraphData>({ nodes: [], links: [] })
 
+  // Level of detail: large graphs are browsed through server-side summaries and pages
+  const [lod, setLod] = useState(false)
+  const [atOverview, setAtOverview] = useState(true)
+  // Next page of the community being browsed, if it has more members
+  const [clusterPage, setClusterPage] = useState<{ clusterId: number; offset: number; total: number } | null>(null)
+  const [graphTotals, setGraphTotals] = useState<{ nodes: number; edges: number } | null>(null)
+
   // Visual state
   const [nodeScores, setNodeScores] = useState<Record<string, number>>({})
   const [highlightedNodeIds, setHighlightedNodeIds] = useState<Set<string>>(new Set())
@@ -36,8 +69,8 @@ export default function App() {
 
   // Stats
   const [chunkProgress, setChunkProgress] = useState<{ current: number; total: number } | null>(null)
-  const entityCount = graphData.nodes.length
-  const edgeCount = graphData.links.length
+  const entityCount = graphTotals?.nodes ?? graphData.nodes.length
+  const edgeCount = graphTotals?.edges ?? graphData.links.length
 
   // Initialise session
   useEffect(() => {
@@ -46,6 +79,66 @@ export default function App() {
       .then(d => setSessionId(d.session_id))
   }, [])
 
+  const showPage = useCallback((nodes: NodePayload[], edges: EdgePayload[], merge: boolean) => {
+    setGraphData(prev => {
+      if (!merge) {
+        return { nodes: nodes.map(n => toGraphNode(n, true)), links: edges.map(toGraphEdge) }
+      }
+      const nodeIds = new Set(prev.nodes.map(n => n.id))
+      const edgeIds = new Set(prev.links.map(e => e.id))
+      const merged = [...prev.nodes, ...nodes.filter(n => !nodeIds.has(n.id)).map(n => toGraphNode(n, true))]
+      const visible = new Set(merged.map(n => n.id))
+      const links = [
+        ...prev.links,
+        ...edges
+          .filter(e => !edgeIds.has(e.id) && visible.has(e.source) && visible.has(e.target))
+          .map(toGraphEdge),
+      ]
+      return { nodes: merged, links }
+    })
+  }, [])
+
+  const loadSummary = useCallback(() => {
+    if (!sessionId) return
+    fetch(`${API}/graph/${sessionId}/summary`)
+      .then(r => r.json())
+      .then((summary: GraphSummary) => {
+        setGraphTotals({ nodes: summary.total_nodes, edges: summary.total_edges })
+        showPage(summary.nodes, summary.edges, false)
+        setAtOverview(true)
+        setClusterPage(null)
+        setPhase(prev => (prev === 'ingesting' || prev === 'idle' ? 'ready' : prev))
+      })
+  }, [sessionId, showPage])
+
+  const loadNeighborhood = useCallback((nodeIds: string[], hops: number, limit: number, merge: boolean) => {
+    if (!sessionId || nodeIds.length === 0) return
+    const params = new URLSearchParams({ hops: String(hops), limit: String(limit) })
+    nodeIds.forEach(id => params.append('node_id', id))
+    fetch(`${API}/graph/${sessionId}/neighborhood?${params}`)
+      .then(r => (r.ok ? r.json() : null))
+      .then((page: GraphPage | null) => {
+        if (!page) return
+        showPage(page.nodes, page.edges, merge)
+        setAtOverview(false)
+        if (!merge) setClusterPage(null)
+      })
+  }, [sessionId, showPage])
+
+  const loadCluster = useCallback((clusterId: number, offset: number) => {
+    if (!sessionId) return
+    const params = new URLSearchParams({ offset: String(offset), limit: String(CLUSTER_PAGE_SIZE) })
+    fetch(`${API}/graph/${sessionId}/cluster/${clusterId}?${params}`)
+      .then(r => (r.ok ? r.json() : null))
+      .then((page: GraphPage | null) => {
+        if (!page) return
+        // Later pages only carry edges back to earlier ones, so they merge cleanly
+        showPage(page.nodes, page.edges, offset > 0)
+        setAtOverview(false)
+        setClusterPage(page.next_offset === null ? null : { clusterId, offset: page.next_offset, total: page.total })
+      })
+  }, [sessionId, showPage])
+
   // Handle all websocket events
   const handleEvent = useCallback((event: SynapseEvent) => {
     switch (event.event) {
@@ -53,6 +146,8 @@ export default function App() {
         setPhase('ingesting')
         setDocName(event.doc_name)
         setGraphData({ nodes: [], links: [] })
+        setLod(false)
+        setGraphTotals(null)
         setNodeScores({})
         setHighlightedNodeIds(new Set())
         setRetrievedNodeIds(new Set())
@@ -65,33 +160,32 @@ export default function App() {
 
       case 'ingestion_complete': {
         setChunkProgress(null)
-        const rawNodes: GraphNode[] = event.nodes.map(n => ({
-          ...n,
-          score: 0,
-          isTraversed: false,
-          isRetrieved: false,
-          glowIntensity: 0,
-        }))
-        const rawEdges: GraphEdge[] = event.edges.map(e => ({
-          ...e,
-          isTraversed: false,
-          particleCount: 0,
-        }))
+        if (event.lod) {
+          setLod(true)
+          loadSummary()
+          break
+        }
+        const rawNodes = event.nodes.map(n => toGraphNode(n, false))
+        const rawEdges = event.edges.map(toGraphEdge)
         // Cap total reveal animation: ~3s for nodes, ~1.5s for edges
-        const nodeDelay = rawNodes.length > 0 ? Math.min(30, 3000 / rawNodes.length) : 20
-        const edgeDelay = rawEdges.length > 0 ? Math.min(15, 1500 / rawEdges.length) : 10
-        rawNodes.forEach((node, i) => {
+        const nodeTime = Math.min(rawNodes.length * 30, 3000)
+        const edgeTime = Math.min(rawEdges.length * 15, 1500)
+        const nodeSteps = Math.max(1, Math.ceil(nodeTime / REVEAL_STEP_MS))
+        const edgeSteps = Math.max(1, Math.ceil(edgeTime / REVEAL_STEP_MS))
+        for (let step = 1; step <= nodeSteps; step++) {
+          const count = Math.ceil((rawNodes.length * step) / nodeSteps)
           setTimeout(() => {
-            setGraphData(prev => ({ ...prev, nodes: [...prev.nodes, node] }))
-          }, i * nodeDelay)
-        })
-        const totalNodeTime = rawNodes.length * nodeDelay
-        rawEdges.forEach((edge, i) => {
+            setGraphData({ nodes: rawNodes.slice(0, count), links: [] })
+          }, step * REVEAL_STEP_MS)
+        }
+        const totalNodeTime = nodeSteps * REVEAL_STEP_MS
+        for (let step = 1; step <= edgeSteps; step++) {
+          const count = Math.ceil((rawEdges.length * step) / edgeSteps)
           setTimeout(() => {
-            setGraphData(prev => ({ ...prev, links: [...prev.links, edge] }))
-          }, totalNodeTime + i * edgeDelay)
-        })
-        setTimeout(() => setPhase('ready'), totalNodeTime + rawEdges.length * edgeDelay)
+            setGraphData({ nodes: rawNodes, links: rawEdges.slice(0, count) })
+          }, totalNodeTime + step * REVEAL_STEP_MS)
+        }
+        setTimeout(() => setPhase('ready'), totalNodeTime + edgeSteps * REVEAL_STEP_MS)
         break
       }
 
@@ -142,18 +236,21 @@ export default function App() {
       case 'query_complete':
         setIsStreaming(false)
         setPhase('answered')
+        // Bring the retrieved context into view when the full graph isn't loaded
+        if (lod) loadNeighborhood(event.retrieved_node_ids, 1, 300, false)
         break
 
       case 'graph_state': {
         // Reconnect with existing graph
-        const nodes: GraphNode[] = event.graph.nodes.map((n: any) => ({
-          ...n,
-          score: 0,
-          isTraversed: false,
-          isRetrieved: false,
-          glowIntensity: 0,
-        }))
-        setGraphData({ nodes, links: (event.graph as any).edges as GraphEdge[] })
+        if (event.graph.lod) {
+          setLod(true)
+          loadSummary()
+          break
+        }
+        setGraphData({
+          nodes: event.graph.nodes.map(n => toGraphNode(n, false)),
+          links: event.graph.edges.map(toGraphEdge),
+        })
         setPhase('ready')
         break
       }
@@ -164,7 +261,7 @@ export default function App() {
         if (phase === 'querying') setPhase('ready')
         break
     }
-  }, [phase])
+  }, [phase, lod, loadSummary, loadNeighborhood])
 
   useWebSocket(sessionId, handleEvent)
 
@@ -177,8 +274,15 @@ export default function App() {
   }, [])
 
   const handleNodeClick = useCallback((node: GraphNode) => {
-    setSelectedNode(prev => prev?.id === node.id ? null : node)
-  }, [])
+    if (node.is_cluster) {
+      // Drill into a community: replace the overview with its first page of members
+      if (node.cluster_id !== undefined) loadCluster(node.cluster_id, 0)
+      return
+    }
+    const selecting = selectedNode?.id !== node.id
+    setSelectedNode(selecting ? node : null)
+    if (lod && selecting) loadNeighborhood([node.id], 1, 200, true)
+  }, [lod, selectedNode, loadCluster, loadNeighborhood])
 
   const showGraph = phase !== 'idle'
 
@@ -195,9 +299,30 @@ export default function App() {
           traversedEdgeIds={traversedEdgeIds}
           nodeScores={nodeScores}
           activeTraversal={activeTraversal}
+          frozen={lod}
         />
       )}
 
+      {/* Back to the community overview when browsing a large graph */}
+      {lod && !atOverview && (
+        <div className="fixed top-4 left-4 z-50 flex gap-2">
+          <button
+            onClick={loadSummary}
+            className="bg-black/60 backdrop-blur-xl border border-white/10 rounded-xl px-4 py-2 text-xs text-white/70 hover:text-white"
+          >
+            ← Overview
+          </button>
+          {clusterPage && (
+            <button
+              onClick={() => loadCluster(clusterPage.clusterId, clusterPage.offset)}
+              className="bg-black/60 backdrop-blur-xl border border-white/10 rounded-xl px-4 py-2 text-xs text-white/70 hover:text-white"
+            >
+              Load more ({clusterPage.offset} of {clusterPage.total})
+            </button>
+          )}
+        </div>
+      )}
+
       {/* Upload screen overlay */}
       {phase === 'idle' && sessionId && (
         <div className="absolute inset-0 flex items-center justify-center">
@@ -10,6 +10,8 @@ interface Props {
   traversedEdgeIds: Set<string>
   nodeScores: Record<string, number>
   activeTraversal: { from: string; to: string } | null
+  // Nodes carry pinned server-side coordinates; skip the force simulation
+  frozen?: boolean
 }
 
 const ENTITY_COLORS: Record<string, string> = {
@@ -30,6 +32,7 @@ export default function GraphCanvas({
   traversedEdgeIds,
   nodeScores,
   activeTraversal,
+  frozen = false,
 }: Props) {
   const fgRef = useRef<any>(null)
   const [dimensions, setDimensions] = useState({ width: window.innerWidth, height: window.innerHeight })
@@ -58,7 +61,9 @@ export default function GraphCanvas({
       const score = nodeScores[gNode.id] || 0
       const baseColor = ENTITY_COLORS[gNode.type] || '#3a7bd5'
 
-      const baseR = Math.max(4, Math.min(14, 4 + (gNode.connection_count || 0) * 1.2))
+      const baseR = gNode.is_cluster
+        ? Math.min(40, 6 + Math.sqrt(gNode.count || 1) * 2)
+        : Math.max(4, Math.min(14, 4 + (gNode.connection_count || 0) * 1.2))
       const r = isRetrieved ? baseR * 1.5 : isHighlighted ? baseR * 1.2 : baseR
 
       // Glow effect
@@ -133,6 +138,7 @@ export default function GraphCanvas({
 
       // Label — only render when meaningful to reduce clutter
       const showLabel =
+        gNode.is_cluster ||
         isRetrieved ||
         isHighlighted ||
         (globalScale > 0.55 && (gNode.connection_count || 0) >= 3) ||
@@ -198,7 +204,8 @@ export default function GraphCanvas({
         const tgtId = typeof edge.target === 'string' ? edge.target : edge.target?.id
         const edgeKey = `${srcId}-${tgtId}`
         const edgeKeyRev = `${tgtId}-${srcId}`
-        return traversedEdgeIds.has(edgeKey) || traversedEdgeIds.has(edgeKeyRev) ? 2 : 1
+        if (traversedEdgeIds.has(edgeKey) || traversedEdgeIds.has(edgeKeyRev)) return 2
+        return edge.weight ? Math.min(6, 1 + Math.log1p(edge.weight)) : 1
       }}
       linkDirectionalParticles={getLinkParticles}
       linkDirectionalParticleWidth={5}
@@ -212,7 +219,7 @@ export default function GraphCanvas({
       enableZoomInteraction={true}
       enablePanInteraction={true}
       nodeRelSize={1}
-      cooldownTicks={200}
+      cooldownTicks={frozen ? 0 : 200}
       d3AlphaDecay={0.015}
       d3VelocityDecay={0.25}
     />
@@ -8,6 +8,11 @@ export interface GraphNode {
   color: string
   source_doc: string
   connection_count: number
+  // Server-side layout and level of detail
+  cluster_id?: number
+  is_cluster?: boolean
+  count?: number
+  hop?: number
   // Runtime visual state
   score?: number
   isTraversed?: boolean
@@ -28,6 +33,7 @@ export interface GraphEdge {
   target: string | GraphNode
   label: string
   source_sentence: string
+  weight?: number
   // Runtime visual state
   isTraversed?: boolean
   particleCount?: number
@@ -38,13 +44,34 @@ export interface GraphData {
   links: GraphEdge[]
 }
 
+export type NodePayload = Omit<GraphNode, 'score' | 'isTraversed' | 'isRetrieved' | 'glowIntensity'>
+export type EdgePayload = { id: string; source: string; target: string; label: string; source_sentence: string; weight?: number }
+
+// Responses of the /graph/{session_id}/... level-of-detail endpoints
+export interface GraphSummary {
+  nodes: NodePayload[]
+  edges: EdgePayload[]
+  total_nodes: number
+  total_edges: number
+  total_clusters: number
+  hidden_nodes: number
+}
+
+export interface GraphPage {
+  nodes: NodePayload[]
+  edges: EdgePayload[]
+  total: number
+  offset: number
+  next_offset: number | null
+}
+
 export type SynapseEvent =
   | { event: 'ingestion_started'; doc_name: string }
   | { event: 'ingestion_progress'; message: string; total_chunks: number }
   | { event: 'chunk_processing'; chunk: number; total: number }
   | { event: 'entity_extracted'; node: Omit<GraphNode, 'score' | 'isTraversed' | 'isRetrieved' | 'glowIntensity'> }
   | { event: 'edge_extracted'; edge: { id: string; source: string; target: string; label: string; source_sentence: string } }
-  | { event: 'ingestion_complete'; stats: { entities: number; relationships: number; chunks_processed: number }; nodes: Omit<GraphNode, 'score' | 'isTraversed' | 'isRetrieved' | 'glowIntensity'>[]; edges: { id: string; source: string; target: string; label: string; source_sentence: string }[] }
+  | { event: 'ingestion_complete'; stats: { entities: number; relationships: number; chunks_processed: number }; nodes: NodePayload[]; edges: EdgePayload[]; lod: boolean }
   | { event: 'query_received'; query: string; tokens: string[] }
   | { event: 'node_scored'; node_id: string; score: number }
   | { event: 'traversal_hop'; from_id: string; to_id: string }
@@ -52,7 +79,7 @@ export type SynapseEvent =
   | { event: 'answer_start' }
   | { event: 'answer_token'; token: string }
   | { event: 'query_complete'; answer: string; retrieved_node_ids: string[]; traversal_path: { from: string; to: string }[] }
-  | { event: 'graph_state'; graph: { nodes: GraphNode[]; links: GraphEdge[] } }
+  | { event: 'graph_state'; graph: { nodes: NodePayload[]; edges: EdgePayload[]; lod: boolean; total_nodes: number; total_edges: number } }
   | { event: 'error'; message: string }
   | { event: 'heartbeat' }
   | { event: 'pong' }